@@ -2,9 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import datetime
+import re
 from abc import ABC, abstractmethod
 from enum import Enum, unique
 from functools import lru_cache
+from string import Formatter
+from types import MappingProxyType
 from typing import (
     Any, Dict, FrozenSet, Hashable, List, Mapping, NamedTuple, Optional,
     Sequence, Set, Tuple, Type, TypeVar
@@ -139,6 +142,7 @@ class Property(NamedTuple):
     def format(self, value: Any) -> str:
         return self.type.value.format(value)
 
+    @lru_cache()
     def header(self) -> str:
         formatted = f'{self.name}:{self.type.name}'
         if self.cardinality:
@@ -149,6 +153,9 @@ class Property(NamedTuple):
 
 
 class MagicProperty(Property):
+    # like Property (as a NamedTuple), no instance __dict__
+    __slots__ = ()
+
     @overrides
     def header(self) -> str:
         return self.name
@@ -180,20 +187,47 @@ class WellKnownProperties(Enum):
     ''')
 
 
+# plain bindings for the enum values used per entity in create (saves the Enum .value lookups in bulk loads)
+_ID_PROPERTY: Property = MagicProperties.ID.value
+_ID_NAME: str = _ID_PROPERTY.name
+_LABEL_PROPERTY: Property = MagicProperties.LABEL.value
+_LABEL_NAME: str = _LABEL_PROPERTY.name
+
+
 # TODO: move this someplace shared
+@lru_cache()
 def _discover_parameters(format_string: str) -> FrozenSet[str]:
     """
     use this to discover what the parameters are to a format string (e.g. what parameters we need for a vertex id)
     """
-    parameters: FrozenSet[str] = frozenset()
-    while True:
-        try:
-            format_string.format(**dict((k, '') for k in parameters))
-            return parameters
-        except KeyError as e:
-            updated = parameters.union(set(e.args))
-            assert updated != parameters
-            parameters = updated
+    parameters: Set[str] = set()
+    for _, field_name, format_spec, _ in Formatter().parse(format_string):
+        if field_name is None:
+            continue
+        # field_name can be like key.attribute or key[index], we only care about the key
+        parameters.add(re.split(r'[.[]', field_name, maxsplit=1)[0])
+        # and the format_spec can itself have fields, e.g. {a:{w}}
+        if format_spec:
+            parameters.update(_discover_parameters(format_spec))
+    return frozenset(parameters)
+
+
+class _CreatePlan(NamedTuple):
+    """
+    what create checks and fills in, worked out once per type rather than per entity
+    """
+    has_id: bool
+    has_label: bool
+    names: FrozenSet[str]
+    required_names: FrozenSet[str]
+    with_defaults: Tuple[Tuple[str, Property], ...]
+
+    @classmethod
+    def of(cls, properties: Mapping[str, Property]) -> "_CreatePlan":
+        return cls(has_id=_ID_PROPERTY in properties.values(), has_label=_LABEL_PROPERTY in properties.values(),
+                   names=frozenset(properties),
+                   required_names=frozenset(k for k, v in properties.items() if v.required),
+                   with_defaults=tuple((k, v) for k, v in properties.items() if v.default is not None))
 
 
 V = TypeVar('V')
@@ -241,35 +275,37 @@ class VertexType(NamedTuple):
         assert len(mapping) == len(self.properties), f'are property names not unique? {self.properties}'
         return mapping
 
+    @lru_cache()
+    def _create_plan(self) -> _CreatePlan:
+        return _CreatePlan.of(self.properties_as_map())
+
     def id(self, **entity: Any) -> str:
         for name, value in (self.defaults or ()):
             if name not in entity:
                 entity[name] = value
         # format them if they're not already.  (the isinstance(v, str) feels wrong here tho)
-        values = dict([(n, (self.properties_as_map()[n].format(v) if v is not None and not isinstance(v, str) else v))
-                       for n, v in entity.items()])
-        values.update({'~label': self.label})
+        values = {n: (self.properties_as_map()[n].format(v) if v is not None and not isinstance(v, str) else v)
+                  for n, v in entity.items()}
+        values[_LABEL_NAME] = self.label
         return self.id_format.format(**values)
 
     def create(self, **properties: Any) -> Mapping[str, Any]:
-        if MagicProperties.ID.value in self.properties and MagicProperties.ID.value.name not in properties:
-            properties[MagicProperties.ID.value.name] = self.id(**properties)
-        if MagicProperties.LABEL.value in self.properties and MagicProperties.LABEL.value.name not in properties:
-            properties[MagicProperties.LABEL.value.name] = self.label
+        plan = self._create_plan()
+        if plan.has_id and _ID_NAME not in properties:
+            properties[_ID_NAME] = self.id(**properties)
+        if plan.has_label and _LABEL_NAME not in properties:
+            properties[_LABEL_NAME] = self.label
         for name, value in (self.defaults or ()):
             if name not in properties:
                 properties[name] = value
         # remove missing values
         for k in [k for k, v in properties.items() if v is None]:
             del properties[k]
-        properties.update([(k, v) for k, v in self.properties_as_map().items()
-                           if v.default is not None and k not in properties])
-        property_names = set(self.properties_as_map().keys())
-        assert set(properties.keys()).issubset(property_names), \
-            f'unexpected properties: properties: {properties}, expected names: {property_names}'
-        required_property_names = set([k for k, v in self.properties_as_map().items() if v.required])
-        assert set(properties.keys()).issuperset(required_property_names), \
-            f'expected required properties: properties: {properties}, expected names: {required_property_names}'
+        properties.update([(k, v) for k, v in plan.with_defaults if k not in properties])
+        assert properties.keys() <= plan.names, \
+            f'unexpected properties: properties: {properties}, expected names: {set(plan.names)}'
+        assert properties.keys() >= plan.required_names, \
+            f'expected required properties: properties: {properties}, expected names: {set(plan.required_names)}'
         return properties
 
 
@@ -315,30 +351,32 @@ class EdgeType(NamedTuple):
         assert len(mapping) == len(self.properties), f'are property names not unique? {self.properties}'
         return mapping
 
+    @lru_cache()
+    def _create_plan(self) -> _CreatePlan:
+        return _CreatePlan.of(self.properties_as_map())
+
     def id(self, **entity: Any) -> str:
         # format them if they're not already.  (the isinstance(v, str) feels wrong here tho)
-        values = dict([(n, (self.properties_as_map()[n].format(v) if v is not None and not isinstance(v, str) else v))
-                       for n, v in entity.items()])
-        values.update({'~label': self.label})
+        values = {n: (self.properties_as_map()[n].format(v) if v is not None and not isinstance(v, str) else v)
+                  for n, v in entity.items()}
+        values[_LABEL_NAME] = self.label
         return self.id_format.format(**values)
 
     def create(self, **properties: Any) -> Mapping[str, Any]:
         properties = dict(properties)
-        if MagicProperties.ID.value in self.properties and MagicProperties.ID.value.name not in properties:
-            properties[MagicProperties.ID.value.name] = self.id(**properties)
-        if MagicProperties.LABEL.value in self.properties and MagicProperties.LABEL.value.name not in properties:
-            properties[MagicProperties.LABEL.value.name] = self.label
+        plan = self._create_plan()
+        if plan.has_id and _ID_NAME not in properties:
+            properties[_ID_NAME] = self.id(**properties)
+        if plan.has_label and _LABEL_NAME not in properties:
+            properties[_LABEL_NAME] = self.label
         # remove missing values
         for k in [k for k, v in properties.items() if v is None]:
             del properties[k]
-        properties.update([(k, v) for k, v in self.properties_as_map().items()
-                           if v.default is not None and k not in properties])
-        property_names = set(self.properties_as_map().keys())
-        assert set(properties.keys()).issubset(property_names), \
-            f'unexpected properties: properties: {properties}, expected names: {property_names}'
-        required_property_names = set([k for k, v in self.properties_as_map().items() if v.required])
-        assert set(properties.keys()).issuperset(required_property_names), \
-            f'expected required properties: properties: {properties}, expected names: {required_property_names}'
+        properties.update([(k, v) for k, v in plan.with_defaults if k not in properties])
+        assert properties.keys() <= plan.names, \
+            f'unexpected properties: properties: {properties}, expected names: {set(plan.names)}'
+        assert properties.keys() >= plan.required_names, \
+            f'expected required properties: properties: {properties}, expected names: {set(plan.required_names)}'
         return properties
 
 
@@ -353,7 +391,8 @@ class VertexTypes(Enum):
         constants: List[VertexTypes] = list(cls)
         mapping = dict([(c.value.label, c) for c in constants])
         assert len(mapping) == len(constants), f'are label names not unique? {constants}'
-        return mapping
+        # it's cached and shared, so don't hand out something mutable
+        return MappingProxyType(mapping)
 
     Application = VertexType.construct_type(
         label='Application',
@@ -459,7 +498,8 @@ class EdgeTypes(Enum):
         constants: List[EdgeTypes] = list(cls)
         mapping = dict([(c.value.label, c) for c in constants])
         assert len(mapping) == len(constants), f'are label names not unique? {constants}'
-        return mapping
+        # it's cached and shared, so don't hand out something mutable
+        return MappingProxyType(mapping)
 
     @classmethod
     @lru_cache()
@@ -118,8 +118,9 @@ def append_traversal(g: Traversal, *traversals: Optional[Traversal]) -> GraphTra
     bytecode = Bytecode(bytecode=g.bytecode)
     for t in [t for t in traversals if t is not None]:
         assert t.graph is None, f'traversal has a graph source!  should be an anonymous traversal: {t}'
-        for source_name, *source_args in t.bytecode.source_instructions:
-            bytecode.add_source(source_name, *source_args)
-        for step_name, *step_args in t.bytecode.step_instructions:
-            bytecode.add_step(step_name, *step_args)
+        # the instructions are already converted, so no need to go through add_source/add_step (which would convert
+        # them again), but do keep the bindings that converting them collected.
+        bytecode.source_instructions.extend(t.bytecode.source_instructions)
+        bytecode.step_instructions.extend(t.bytecode.step_instructions)
+        bytecode.bindings.update(t.bytecode.bindings)
     return GraphTraversal(graph=g.graph, traversal_strategies=g.traversal_strategies, bytecode=bytecode)
@@ -498,7 +498,7 @@ def format_entity(entity_type: GraphEntityType, entity: GraphEntity) -> Formatte
         f'some properties in the entity are not in the entity type? entity: {entity}, type: {entity_type}'
     assert set(entity.keys()).issuperset(set([k for k, p in properties.items() if p.required])), \
         f'some required properties in the entity are not present? entity: {entity}, type: {entity_type}'
-    return dict([(n, properties[n].format(v)) for n, v in entity.items()])
+    return {n: properties[n].format(v) for n, v in entity.items()}
 
 
 # these seem to match the format that neptune-export produces (which doesn't use csv.writer)
@@ -11,7 +11,7 @@ import datetime
 from abc import ABCMeta, abstractmethod
 from itertools import starmap
 from typing import (
-    Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Set, Union
+    Any, Callable, Dict, List, Mapping, Sequence, Set, Type, Union
 )
 
 from gremlin_python.driver.remote_connection import RemoteStrategy
@@ -26,6 +26,28 @@ from gremlin_python.structure.graph import (
 from overrides import overrides
 
 
+def _escape_java_style_char(ch: int) -> str:
+    if ch < 0x7f and ch >= 32:
+        return chr(ch)
+    # handle unicode and control characters
+    return f'''\\u{hex(ch)[2:].rjust(4, '0')}'''
+
+
+class _JavaStyleEscapeTable(Dict[int, str]):
+    """
+    str.translate table: the given mappings, printable ascii as is, and everything else (control characters and
+    unicode) as a \\u escape.  The latin-1 range is filled in up front, anything past it is escaped on each use (but
+    not kept, so the table stays the same size however much unicode gets translated).
+    """
+    def __init__(self, mappings: Mapping[int, str]) -> None:
+        super().__init__(mappings)
+        for ch in range(0x100):
+            self.setdefault(ch, _escape_java_style_char(ch))
+
+    def __missing__(self, ch: int) -> str:
+        return _escape_java_style_char(ch)
+
+
 class ScriptTranslator(metaclass=ABCMeta):
     @classmethod
     def translateB(cls, traversal_source: str, bytecode: Bytecode) -> str:
@@ -55,17 +77,15 @@ class ScriptTranslator(metaclass=ABCMeta):
 
     @classmethod  # noqa: C901
     def _convert_to_string(cls, thing: Any) -> str:
-        if thing is None:
-            return "null"
-
-        if isinstance(thing, bool):
-            # TODO: this is java/groovy specific
-            # also, did you know that isinstance(True, int) == True? so do this ahead of the int/float branch below
-            return repr(thing).lower()
+        # the common leaf values by exact type first, the isinstance ladder below handles the rest (and subclasses).
+        # NB: None and bool can't be subclassed, so they're only ever converted here (which also means bool is
+        # handled before the int/float branch below: did you know that isinstance(True, int) == True?)
+        converter = _CONVERTERS_BY_TYPE.get(type(thing))
+        if converter is not None:
+            return converter(cls, thing)
 
         if isinstance(thing, (int, float)):
-            # TODO: do we need the f, L, d suffixes?
-            return repr(thing)
+            return cls._number_to_string(thing)
 
         if isinstance(thing, str):
             return cls._escape_java_style(thing)
@@ -112,6 +132,20 @@ class ScriptTranslator(metaclass=ABCMeta):
 
         raise AssertionError(f'thing is not supported!: {thing}')
 
+    @classmethod
+    def _null_to_string(cls, thing: None) -> str:
+        return 'null'
+
+    @classmethod
+    def _bool_to_string(cls, thing: bool) -> str:
+        # TODO: this is java/groovy specific
+        return repr(thing).lower()
+
+    @classmethod
+    def _number_to_string(cls, thing: Union[int, float]) -> str:
+        # TODO: do we need the f, L, d suffixes?
+        return repr(thing)
+
     @classmethod
     @abstractmethod
     def _date_to_string(cls, thing: Union[datetime.datetime, datetime.date]) -> str:
@@ -135,21 +169,26 @@ class ScriptTranslator(metaclass=ABCMeta):
     CHAR_MAPPINGS = dict([(ord(v), f'\\{c}') for v, c in zip('\b\n\t\f\r', 'bntfr')]
                          + [(ord(s), f'\\{s}') for s in '\'"\\'])
 
-    @classmethod
-    def _escape_java_style_chars(cls, chars: Iterable[int]) -> Iterator[str]:
-        for ch in chars:
-            # handle unicode
-            if ch in cls.CHAR_MAPPINGS:
-                yield cls.CHAR_MAPPINGS[ch]
-            elif ch < 0x7f and ch >= 32:
-                yield chr(ch)
-            else:
-                # handle unicode and control characters
-                yield f'''\\u{hex(ch)[2:].rjust(4, '0')}'''
+    ESCAPE_TABLE = _JavaStyleEscapeTable(CHAR_MAPPINGS)
 
     @classmethod
     def _escape_java_style(cls, value: str) -> str:
-        return f'''"{''.join(cls._escape_java_style_chars(map(ord, value)))}"'''
+        return f'''"{value.translate(cls.ESCAPE_TABLE)}"'''
+
+
+_CONVERTERS_BY_TYPE: Mapping[type, Callable[[Type[ScriptTranslator], Any], str]] = {
+    type(None): lambda cls, thing: cls._null_to_string(thing),
+    bool: lambda cls, thing: cls._bool_to_string(thing),
+    int: lambda cls, thing: cls._number_to_string(thing),
+    float: lambda cls, thing: cls._number_to_string(thing),
+    str: lambda cls, thing: cls._escape_java_style(thing),
+    datetime.datetime: lambda cls, thing: cls._date_to_string(thing),
+    datetime.date: lambda cls, thing: cls._date_to_string(thing),
+}
+
+
+_JANUSGRAPH_DATETIME_PARSE = '''new java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss.SSSSSS").parse'''
+_JANUSGRAPH_DATE_PARSE = '''new java.text.SimpleDateFormat("yyyy-MM-dd").parse'''
 
 
 class ScriptTranslatorTargetJanusgraph(ScriptTranslator):
@@ -161,10 +200,10 @@ class ScriptTranslatorTargetJanusgraph(ScriptTranslator):
             # antiquity). If milliseconds/microseconds == 0, then it OMITS them (as if yyyy-MM-dd'T'HH:mm:ss), which
             # is usually fine. Except here where we're passing it into java.text.SimpleDateFormat, which is strict.
             # so timespec='microseconds' to get those every time.
-            return f'''new java.text.SimpleDateFormat("yyyy-MM-dd'T'HH:mm:ss.SSSSSS").parse("{thing.isoformat(timespec='microseconds')}")'''  # noqa: E501
+            return f'''{_JANUSGRAPH_DATETIME_PARSE}("{thing.isoformat(timespec='microseconds')}")'''
         elif isinstance(thing, datetime.date):
             # so timespec is not a thing for datetime.date though, so use the date only format produced there.
-            return f'''new java.text.SimpleDateFormat("yyyy-MM-dd").parse("{thing.isoformat()}")'''
+            return f'''{_JANUSGRAPH_DATE_PARSE}("{thing.isoformat()}")'''
         else:
             raise AssertionError(f'thing is not supported!: {thing}')
 
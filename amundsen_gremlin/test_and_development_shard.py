@@ -1,7 +1,6 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-import distutils.util
 import os
 from threading import Lock
 from typing import Optional
@@ -14,8 +13,20 @@ _shard_lock = Lock()
 _shard_used = False
 
 
+def _strtobool(value: str) -> bool:
+    """
+    distutils.util.strtobool, without importing distutils (which drags in setuptools and most of our import time)
+    """
+    value = value.lower()
+    if value in ('y', 'yes', 't', 'true', 'on', '1'):
+        return True
+    elif value in ('n', 'no', 'f', 'false', 'off', '0'):
+        return False
+    raise ValueError(f'invalid truth value {value!r}')
+
+
 def _shard_default() -> Optional[str]:
-    if distutils.util.strtobool(os.environ.get('IGNORE_NEPTUNE_SHARD', 'False')):
+    if _strtobool(os.environ.get('IGNORE_NEPTUNE_SHARD', 'False')):
         return None
     elif os.environ.get('CI'):
         # TODO: support CI-specific env variables in config?
@@ -1,11 +1,15 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
 import threading
+from asyncio import Future
+from collections import abc
+from itertools import islice
 from typing import (
-    Any, AsyncIterator, Callable, Collection, Iterable, Iterator, List,
-    Optional, Tuple, TypeVar, Union
+    Any, AsyncIterator, Awaitable, Callable, Collection, FrozenSet, Iterable,
+    Iterator, List, Optional, Set, Tuple, TypeVar, Union
 )
 
 from typing_extensions import Final, final
@@ -25,6 +29,8 @@ class PeekingIterator(Iterator[V]):
     """
     Like Iterator, but with peek(), peek_default(), and take_peeked()
     """
+    __slots__ = ('it', 'has_peeked_value', 'peeked_value', 'lock')
+
     def __init__(self, iterable: Iterable[V]):
         self.it: Final[Iterator[V]] = iterable if isinstance(iterable, Iterator) else iter(iterable)
         self.has_peeked_value = False
@@ -41,14 +47,11 @@ class PeekingIterator(Iterator[V]):
         :raises StopIteration if there is no more values
         """
         with self.lock:
-            value: V
-            if self.has_peeked_value:
-                value = self.peeked_value  # type: ignore
-                self.peeked_value = None
-                self.has_peeked_value = False
-            else:
-                value = next(self.it)
-            assert not self.has_peeked_value
+            if not self.has_peeked_value:
+                return next(self.it)
+            value: V = self.peeked_value  # type: ignore
+            self.peeked_value = None
+            self.has_peeked_value = False
             return value
 
     @final
@@ -95,6 +98,8 @@ class PeekingAsyncIterator(AsyncIterator[V]):
     """
     Like AsyncIterator, but with peek(), peek_default(), and take_peeked()
     """
+    __slots__ = ('it', 'has_peeked_value', 'peeked_value', 'lock')
+
     def __init__(self, iterable: AsyncIterator[V]):
         self.it: Final[AsyncIterator[V]] = iterable
         self.has_peeked_value = False
@@ -117,7 +122,7 @@ class PeekingAsyncIterator(AsyncIterator[V]):
                 self.peeked_value = None
                 self.has_peeked_value = False
             else:
-                value = await self.__anext__()
+                value = await self.it.__anext__()
             assert not self.has_peeked_value
             return value
 
@@ -170,41 +175,53 @@ def one_chunk(*, it: PeekingIterator[V], n: int, metric: Callable[[V], int]) ->
     :returns the chunk
     """
     items: List[V] = []
+    has_more = _fill_one_chunk(it=it, n=n, metric=metric, items=items)
+    return tuple(items), has_more
+
+
+def _fill_one_chunk(*, it: PeekingIterator[V], n: int, metric: Callable[[V], int], items: List[V]) -> bool:
+    """
+    like one_chunk, but appends the chunk to items (which should be empty)
+    :returns if there are more items
+    """
+    if metric is one and n > 0:
+        # every item counts 1, so it's just the next n (islice picks up any peeked value via __next__)
+        items.extend(islice(it, n))
+        return it.has_more()
+
     items_metric: int = 0
+    # this runs once per item, so look these up once per chunk instead
+    peek = it.peek
+    take_peeked = it.take_peeked
+    append = items.append
     try:
         while True:
-            item = it.peek()
+            item = peek()
             item_metric = metric(item)
             # negative would be insane, let's say positive
             assert item_metric > 0, \
                 f'expected metric to be positive! item_metric={item_metric}, metric={metric}, item={item}'
-            if not items and item_metric > n:
+            new_total = items_metric + item_metric
+            if new_total > n:
+                if items:
+                    # we're full
+                    break
                 # should we assert instead? it's probably a surprise to the caller too, and might fail for whatever
                 # limit they were trying to avoid, but let's give them a shot at least.
                 LOGGER.error(f"expected a single item's metric to be less than the chunk limit! {item_metric} > {n}, "
                              f"but returning to make progress")
-                items.append(item)
-                it.take_peeked(item)
-                items_metric += item_metric
-                break
-            elif items_metric + item_metric <= n:
-                items.append(item)
-                it.take_peeked(item)
-                items_metric += item_metric
-                if items_metric >= n:
-                    # we're full
-                    break
-                # else keep accumulating
-            else:
-                assert items_metric + item_metric > n
-                # we're full
+            append(item)
+            take_peeked(item)
+            items_metric = new_total
+            if items_metric >= n:
+                # we're full (or over, if that was a single oversized item)
                 break
+            # else keep accumulating
     # don't catch exception, let that be a concern for callers
     except StopIteration:
         pass
 
-    has_more = it.has_more()
-    return tuple(items), has_more
+    return it.has_more()
 
 
 def chunk(it: Union[Iterable[V], PeekingIterator[V]], n: int, metric: Callable[[V], int] = one
@@ -226,6 +243,71 @@ def chunk(it: Union[Iterable[V], PeekingIterator[V]], n: int, metric: Callable[[
             yield items
 
 
+def chunk_reusing(it: Union[Iterable[V], PeekingIterator[V]], n: int, metric: Callable[[V], int] = one
+                  ) -> Iterable[List[V]]:
+    """
+    Like chunk, but yields the same list for every chunk (cleared and refilled), so you must be done with (or copy)
+    each chunk before asking for the next one.
+
+    :param it: stream of values as a PeekingIterator (or regular iterable if you are only going to take the first chunk
+    and don't care about the peeked value being consumed)
+    :param n: consume stream until n is reached.
+    :param metric: the callable that returns positive metric for a value
+    :returns the Iterable (generator) of chunks
+    """
+    if metric is one and n > 0 and not isinstance(it, PeekingIterator):
+        yield from _chunk_by_count_reusing(it, n)
+        return
+    if not isinstance(it, PeekingIterator):
+        it = PeekingIterator(it)
+    assert isinstance(it, PeekingIterator)
+    items: List[V] = []
+    has_more: bool = True
+    while has_more:
+        items.clear()
+        has_more = _fill_one_chunk(it=it, n=n, metric=metric, items=items)
+        if items or has_more:
+            yield items
+
+
+def _chunk_by_count(stream: Iterable[V], n: int) -> Iterable[Tuple[V, ...]]:
+    """
+    chunk for the default metric (where it's just a count), without going through PeekingIterator for every value.
+    Like chunk, it looks at the next value before yielding each chunk.
+
+    :param stream: stream of values
+    :param n: the chunk size (must be positive)
+    :returns the Iterable (generator) of chunks
+    """
+    assert n > 0, f'expected n to be positive, not {n}'
+    if type(stream) is tuple:
+        # already in memory (and immutable), so reading ahead doesn't matter and slicing gives the same chunks
+        for i in range(0, len(stream), n):
+            yield stream[i:i + n]
+        return
+    it = iter(stream)
+    head = tuple(islice(it, 1))
+    while head:
+        items = head + tuple(islice(it, n - 1))
+        head = tuple(islice(it, 1))
+        yield items
+
+
+def _chunk_by_count_reusing(stream: Iterable[V], n: int) -> Iterable[List[V]]:
+    """
+    like _chunk_by_count, but refills the same list for every chunk (see chunk_reusing)
+    """
+    assert n > 0, f'expected n to be positive, not {n}'
+    it = iter(stream)
+    items: List[V] = list(islice(it, 1))
+    while items:
+        items.extend(islice(it, n - 1))
+        head = tuple(islice(it, 1))
+        yield items
+        items.clear()
+        items.extend(head)
+
+
 async def async_one_chunk(
         it: PeekingAsyncIterator[V], n: int, metric: Callable[[V], int] = one) -> Tuple[Iterable[V], bool]:
     """
@@ -246,27 +328,22 @@ async def async_one_chunk(
             # negative would be insane, let's say positive
             assert item_metric > 0, \
                 f'expected metric to be positive! item_metric={item_metric}, metric={metric}, item={item}'
-            if not items and item_metric > n:
+            new_total = items_metric + item_metric
+            if new_total > n:
+                if items:
+                    # we're full
+                    break
                 # should we assert instead? it's probably a surprise to the caller too, and might fail for whatever
                 # limit they were trying to avoid, but let's give them a shot at least.
                 LOGGER.error(f"expected a single item's metric to be less than the chunk limit! {item_metric} > {n}, "
                              f"but returning to make progress")
-                items.append(item)
-                it.take_peeked(item)
-                items_metric += item_metric
-                break
-            elif items_metric + item_metric <= n:
-                items.append(item)
-                it.take_peeked(item)
-                items_metric += item_metric
-                if items_metric >= n:
-                    # we're full
-                    break
-                # else keep accumulating
-            else:
-                assert items_metric + item_metric > n
-                # we're full
+            items.append(item)
+            it.take_peeked(item)
+            items_metric = new_total
+            if items_metric >= n:
+                # we're full (or over, if that was a single oversized item)
                 break
+            # else keep accumulating
     # don't catch exception, let that be a concern for callers
     except StopAsyncIteration:
         pass
@@ -294,19 +371,29 @@ async def async_chunk(*, it: Union[AsyncIterator[V], PeekingAsyncIterator[V]], n
 
 
 def reduce_in_chunks(*, stream: Iterable[V], n: int, initial: R,
-                     consumer: Callable[[Iterable[V], R], R], metric: Callable[[V], int] = one) -> R:
+                     consumer: Callable[[Iterable[V], R], R], metric: Callable[[V], int] = one,
+                     reuse_buffer: bool = False) -> R:
     """
     :param stream: stream of values
     :param n: consume stream until n is reached.  if n is 0, process whole stream as one chunk.
     :param metric: the callable that returns positive metric for a value
     :param initial: the initial state
     :param consumer: the callable to handle the chunk
+    :param reuse_buffer: hand the consumer the same list for every chunk (see chunk_reusing) rather than a new tuple,
+    so the consumer must not hold on to it
     :returns the final state
     """
     if n > 0:
-        it = PeekingIterator(stream)
+        chunks: Iterable[Iterable[V]]
+        if reuse_buffer:
+            chunks = chunk_reusing(stream, n, metric)
+        elif metric is one:
+            chunks = _chunk_by_count(stream, n)
+        else:
+            # chunk only wraps stream if it isn't a PeekingIterator already
+            chunks = chunk(it=stream, n=n, metric=metric)
         state = initial
-        for items in chunk(it=it, n=n, metric=metric):
+        for items in chunks:
             state = consumer(items, state)
         return state
     else:
@@ -324,9 +411,9 @@ async def async_reduce_in_chunks(*, stream: AsyncIterator[V], n: int, metric: Ca
     :returns the final state
     """
     if n > 0:
-        it = PeekingAsyncIterator(stream)
         state = initial
-        async for items in async_chunk(it=it, n=n, metric=metric):
+        # async_chunk only wraps stream if it isn't a PeekingAsyncIterator already
+        async for items in async_chunk(it=stream, n=n, metric=metric):
             state = consumer(items, state)
         return state
     else:
@@ -334,12 +421,13 @@ async def async_reduce_in_chunks(*, stream: AsyncIterator[V], n: int, metric: Ca
 
 
 def consume_in_chunks(*, stream: Iterable[V], n: int, consumer: Callable[[Iterable[V]], None],
-                      metric: Callable[[V], int] = one) -> int:
+                      metric: Callable[[V], int] = one, reuse_buffer: bool = False) -> int:
     """
     :param stream:
     :param n: consume stream until n is reached if n is 0, process whole stream as one chunk
     :param metric: the callable that returns positive metric for a value
     :param consumer: the callable to handle the chunk
+    :param reuse_buffer: see reduce_in_chunks
     :return:
     """
     _actual_state: int = 0
@@ -350,7 +438,7 @@ def consume_in_chunks(*, stream: Iterable[V], n: int, consumer: Callable[[Iterab
         assert isinstance(things, Collection)   # appease the types
         _actual_state += len(things)
         consumer(things)
-    reduce_in_chunks(stream=stream, n=n, initial=None, consumer=_consumer, metric=metric)
+    reduce_in_chunks(stream=stream, n=n, initial=None, consumer=_consumer, metric=metric, reuse_buffer=reuse_buffer)
     return _actual_state
 
 
@@ -369,6 +457,39 @@ async def async_consume_in_chunks(*, stream: AsyncIterator[V], n: int, consumer:
     return _actual_state
 
 
+async def async_consume_as_completed(*, stream: Iterable[Awaitable[V]], n: int, consumer: Callable[[V], None]) -> int:
+    """
+    Unlike async_consume_in_chunks, this hands each result to the consumer as soon as it is ready (rather than waiting
+    on the slowest in a chunk), so the consumer sees them in completion order, not stream order.
+
+    :param stream: stream of awaitables, which are only started as there is room for them
+    :param n: how many to have in flight at once
+    :param consumer: the callable to handle each result
+    :return: how many results were consumed
+    """
+    assert n > 0, f'expected n to be positive, not {n}'
+    it = iter(stream)
+    pending: Set['Future[V]'] = set(map(asyncio.ensure_future, islice(it, n)))
+    done: Set['Future[V]'] = set()
+    count: int = 0
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            while done:
+                consumer(done.pop().result())
+                count += 1
+            pending.update(map(asyncio.ensure_future, islice(it, n - len(pending))))
+    finally:
+        # only if the consumer or an awaitable blew up: read what finished alongside it (so asyncio doesn't log their
+        # exceptions as never retrieved), and cancel what hasn't
+        for future in done:
+            if not future.cancelled():
+                future.exception()
+        for future in pending:
+            future.cancel()
+    return count
+
+
 def consume_in_chunks_with_state(*, stream: Iterable[V], n: int, consumer: Callable[[Iterable[V]], None],
                                  state: Callable[[V], R], metric: Callable[[V], int] = one) -> Iterable[R]:
     _actual_state: List[R] = list()
@@ -384,8 +505,12 @@ def consume_in_chunks_with_state(*, stream: Iterable[V], n: int, consumer: Calla
     return tuple(_actual_state)
 
 
+# the usual collections, checked by exact type before the (much slower) isinstance against the Collection ABC
+_COLLECTION_TYPES: FrozenSet[type] = frozenset((tuple, list, set, frozenset, range, dict))
+
+
 def _assure_collection(iterable: Iterable[V]) -> Collection[V]:
-    if isinstance(iterable, Collection):
-        return iterable
+    if type(iterable) in _COLLECTION_TYPES or isinstance(iterable, abc.Collection):
+        return iterable  # type: ignore  # the exact type check does not narrow
     else:
         return tuple(iterable)
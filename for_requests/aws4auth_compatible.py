@@ -4,6 +4,9 @@
 from typing import Union
 from urllib.parse import SplitResult, urlsplit
 
+# the ports a server would omit from the Host when canonicalizing
+_DEFAULT_PORTS = {'https': 443, 'http': 80}
+
 
 def to_aws4_request_compatible_host(url: Union[str, SplitResult]) -> str:
     """
@@ -18,7 +21,9 @@ def to_aws4_request_compatible_host(url: Union[str, SplitResult]) -> str:
     elif isinstance(url, SplitResult):
         result = url
     # we have to canonicalize the URL as the server would (so omit if https and port 443 or http and port 80)
-    if (result.scheme == 'https' and result.port == 443) or (result.scheme == 'http' and result.port == 80):
-        return result.netloc.split(':')[0]
+    # (and only look at the port if the scheme has a default, since parsing it can raise)
+    default_port = _DEFAULT_PORTS.get(result.scheme)
+    if default_port is not None and result.port == default_port:
+        return result.netloc.rsplit(':', 1)[0]
     else:
         return result.netloc
@@ -4,18 +4,39 @@
 """
 Credit to https://github.com/dwfreed in https://github.com/requests/toolbelt/issues/159
 """
+import socket
 import ssl
-from typing import Any
+import sys
+from typing import Any, Optional, Union
 
 
 class OverrideServerHostnameSSLContext(ssl.SSLContext):
+    """
+    An SSLContext that ignores the server_hostname it's asked to use and uses its own.  This is a subclass (instead of
+    passing server_hostname to wrap_socket directly) because tornado only accepts an SSLContext (or a dict) for
+    ssl_options, and does its own wrapping.  Both wrap_socket and wrap_bio (which asyncio uses) are overridden so the
+    override applies either way.
+    """
     def __init__(self, *args: Any, server_hostname: str, **kwargs: Any) -> None:
-        super(OverrideServerHostnameSSLContext, self).__init__(*args, **kwargs)
+        # ssl.SSLContext takes the protocol in __new__, and only before python 3.7 in an __init__ of its own too
+        if sys.version_info < (3, 7):
+            super(OverrideServerHostnameSSLContext, self).__init__(*args, **kwargs)
         self.override_server_hostname = server_hostname
 
     def change_server_hostname(self, server_hostname: str) -> None:
         self.override_server_hostname = server_hostname
 
-    def wrap_socket(self, *args: Any, **kwargs: Any) -> Any:
-        kwargs['server_hostname'] = self.override_server_hostname
-        return super(OverrideServerHostnameSSLContext, self).wrap_socket(*args, **kwargs)
+    def wrap_socket(self, sock: socket.socket, server_side: bool = False, do_handshake_on_connect: bool = True,
+                    suppress_ragged_eofs: bool = True, server_hostname: Optional[Union[str, bytes]] = None,
+                    session: Optional[ssl.SSLSession] = None) -> ssl.SSLSocket:
+        # spelled out (rather than *args, **kwargs) so server_hostname is ignored whether passed by keyword or position
+        return super(OverrideServerHostnameSSLContext, self).wrap_socket(
+            sock, server_side=server_side, do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs, server_hostname=self.override_server_hostname, session=session)
+
+    def wrap_bio(self, incoming: ssl.MemoryBIO, outgoing: ssl.MemoryBIO, server_side: bool = False,
+                 server_hostname: Optional[Union[str, bytes]] = None,
+                 session: Optional[ssl.SSLSession] = None) -> ssl.SSLObject:
+        # spelled out (rather than *args, **kwargs) so server_hostname is ignored whether passed by keyword or position
+        return super(OverrideServerHostnameSSLContext, self).wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=self.override_server_hostname, session=session)
@@ -0,0 +1,30 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from urllib.parse import urlsplit
+
+from for_requests.aws4auth_compatible import to_aws4_request_compatible_host
+
+_CASES = (
+    ('https://foo.example.com', 'foo.example.com'),
+    ('https://foo.example.com:443/gremlin', 'foo.example.com'),
+    ('http://foo.example.com:80/gremlin', 'foo.example.com'),
+    ('https://foo.example.com:8182/gremlin', 'foo.example.com:8182'),
+    ('http://foo.example.com:443/gremlin', 'foo.example.com:443'),
+    ('https://[::1]:443/gremlin', '[::1]'),
+    ('https://[::1]:8182/gremlin', '[::1]:8182'),
+    ('foo://foo.example.com:abc', 'foo.example.com:abc'),
+)
+
+
+class ToAws4RequestCompatibleHostTest(unittest.TestCase):
+    def test_str(self) -> None:
+        for url, expected in _CASES:
+            with self.subTest(url=url):
+                self.assertEqual(expected, to_aws4_request_compatible_host(url))
+
+    def test_split_result(self) -> None:
+        for url, expected in _CASES:
+            with self.subTest(url=url):
+                self.assertEqual(expected, to_aws4_request_compatible_host(urlsplit(url)))
@@ -3,9 +3,8 @@
 
 import datetime
 import unittest
-from operator import attrgetter
 from typing import (
-    Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Tuple, TypeVar,
+    Any, Callable, ClassVar, Dict, Iterable, List, Mapping, Tuple, TypeVar,
     Union
 )
 from unittest import mock
@@ -17,6 +16,8 @@ from amundsen_common.models.table import (
 from amundsen_common.models.user import User
 from amundsen_common.tests.fixtures import Fixtures
 from flask import Flask
+from flask.ctx import AppContext
+from gremlin_python.process.graph_traversal import GraphTraversalSource
 
 from amundsen_gremlin.config import LocalGremlinConfig
 from amundsen_gremlin.gremlin_model import (
@@ -36,29 +37,86 @@ from amundsen_gremlin.test_and_development_shard import (
 
 # TODO: add fetch test existing tests
 
+# the shard is fixed for the whole test run
+_SHARD = get_shard()
+_CREATED_AT = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185)
+_CREATED_AT_NEXT_DAY = _CREATED_AT + datetime.timedelta(seconds=10, days=1)
+_ID = MagicProperties.ID.value.name
+_LABEL = MagicProperties.LABEL.value.name
+_FROM_AND_TO = (MagicProperties.FROM.value, MagicProperties.TO.value)
+_VT_BY_LABEL = VertexTypes.by_label()
+
 
 def _create_one_expected(_type: Union[VertexType, EdgeType], **properties: Any) -> Tuple[str, Mapping[str, Any]]:
     if isinstance(_type, EdgeType):
-        for property in (MagicProperties.FROM.value, MagicProperties.TO.value):
+        for property in _FROM_AND_TO:
             value = properties.get(property.name)
             # as a convenience construct the id from the properties (since it will usually have all kinds of test
             # shards)
-            if isinstance(value, Mapping) and MagicProperties.LABEL.value.name in value:
-                id = VertexTypes.by_label()[value[MagicProperties.LABEL.value.name]].value.id(**value)
+            if isinstance(value, Mapping) and _LABEL in value:
+                id = _VT_BY_LABEL[value[_LABEL]].value.id(**value)
                 properties[property.name] = id
             property.type.value.is_allowed(properties.get(property.name))
 
     entity = _type.create(**properties)
-    return entity[MagicProperties.ID.value.name], entity
+    return entity[_ID], entity
 
 
 def _create_expected(expected: Mapping[Union[VertexType, EdgeType], Iterable[Mapping[str, Any]]]) -> ENTITIES:
-    return {_type: dict(_create_one_expected(_type, **properties) for properties in entities)  # type: ignore
-            for _type, entities in expected.items()}
+    result: Dict[Union[VertexType, EdgeType], Dict[str, Mapping[str, Any]]] = {}
+    for _type, entities in expected.items():
+        pairs: List[Tuple[str, Mapping[str, Any]]] = []
+        for properties in entities:
+            pairs.append(_create_one_expected(_type, **properties))
+        result[_type] = dict(pairs)
+    return result  # type: ignore
+
+
+def _edge(from_label: str, from_key: str, to_label: str, to_key: str, *,
+          created: datetime.datetime = _CREATED_AT) -> Mapping[str, Any]:
+    """
+    an expected edge (for _create_expected) between the vertexes with those labels and keys
+    """
+    return {'created': created, '~from': {'~label': from_label, 'key': from_key},
+            '~to': {'~label': to_label, 'key': to_key}}
+
+
+def _relabel(entities: Mapping[Union[VertexType, EdgeType], Any]) -> Dict[str, Any]:
+    """
+    key by label instead, which makes the diff a little better
+    """
+    return {k.label: v for k, v in entities.items()}
+
+
+def _fake_existing_side_effect(_type: Union[VertexType, VertexTypes], **properties: Any) -> Callable[..., None]:
+    """
+    for the _FetchExisting mock, so the vertex appears to already exist
+    """
+    def side_effect(*args: Any, existing: EXISTING, **kwargs: Any) -> None:
+        _FetchExisting._fake_into_existing_vertexes_for_testing(_existing=existing, _type=_type, **properties)
+    return side_effect
 
 
 @mock.patch('amundsen_gremlin.neptune_bulk_loader.gremlin_model_converter._FetchExisting')
 class TestGetGraph(unittest.TestCase):
+    # the Database, Cluster, and Schema entities every Snowflake://production.esikmo table has
+    expected_esikmo: ClassVar[ENTITIES]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.expected_esikmo = _create_expected({
+            VertexTypes.Database.value: [
+                {'key': 'database://Snowflake', 'name': 'Snowflake'}],
+            EdgeTypes.Cluster.value: [
+                _edge('Database', 'database://Snowflake', 'Cluster', 'Snowflake://production')],
+            VertexTypes.Cluster.value: [
+                {'key': 'Snowflake://production', 'name': 'production'}],
+            EdgeTypes.Schema.value: [
+                _edge('Cluster', 'Snowflake://production', 'Schema', 'Snowflake://production.esikmo')],
+            VertexTypes.Schema.value: [
+                {'key': 'Snowflake://production.esikmo', 'name': 'esikmo'}],
+        })
+
     def setUp(self) -> None:
         self.maxDiff = None
 
@@ -78,65 +136,47 @@ class TestGetGraph(unittest.TestCase):
                        table_writer=table1.table_writer)
         table_data = [table1, table2]
 
-        def side_effect(*args: Any, existing: EXISTING, **kwargs: Any) -> None:
-            _FetchExisting._fake_into_existing_vertexes_for_testing(
-                _existing=existing, _type=VertexTypes.Application, id='eskimo', key='eskimo')
+        fetch_existing.table_entities.side_effect = _fake_existing_side_effect(
+            VertexTypes.Application, id='eskimo', key='eskimo')
 
-        fetch_existing.table_entities.side_effect = side_effect
-
-        created_at = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185)
-        expected = _create_expected({
-            VertexTypes.Database.value: [
-                {'key': 'database://Snowflake', 'name': 'Snowflake'}],
-            EdgeTypes.Cluster.value: [
-                {'created': created_at, '~from': {'~label': 'Database', 'key': 'database://Snowflake'},
-                 '~to': {'~label': 'Cluster', 'key': 'Snowflake://production'}}],
-            VertexTypes.Cluster.value: [
-                {'key': 'Snowflake://production', 'name': 'production'}],
-            EdgeTypes.Schema.value: [
-                {'created': created_at, '~from': {'~label': 'Cluster', 'key': 'Snowflake://production'},
-                 '~to': {'~label': 'Schema', 'key': 'Snowflake://production.esikmo'}}],
-            VertexTypes.Schema.value: [
-                {'key': 'Snowflake://production.esikmo', 'name': 'esikmo'}],
+        expected = dict(self.expected_esikmo)
+        expected.update(_create_expected({
             EdgeTypes.Table.value: [
-                {'created': created_at, '~from': {'~label': 'Schema', 'key': 'Snowflake://production.esikmo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'}},
-                {'created': created_at, '~from': {'~label': 'Schema', 'key': 'Snowflake://production.esikmo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/floes'}}],
+                _edge('Schema', 'Snowflake://production.esikmo', 'Table', 'Snowflake://production.esikmo/igloo'),
+                _edge('Schema', 'Snowflake://production.esikmo', 'Table', 'Snowflake://production.esikmo/floes')],
             VertexTypes.Table.value: [
                 {'is_view': False, 'key': 'Snowflake://production.esikmo/igloo', 'name': 'igloo'},
                 {'is_view': False, 'key': 'Snowflake://production.esikmo/floes', 'name': 'floes'}],
             EdgeTypes.Tag.value: [
-                {'created': created_at, '~from': {'~label': 'Tag', 'key': 'Kewl'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'}}],
+                _edge('Tag', 'Kewl', 'Table', 'Snowflake://production.esikmo/igloo')],
             VertexTypes.Tag.value: [
                 {'key': 'Kewl', 'tag_name': 'Kewl', 'tag_type': 'default'}],
             EdgeTypes.LastUpdatedAt.value: [
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'Updatedtimestamp', 'key': 'Snowflake://production.esikmo/igloo'}},
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/floes'},
-                 '~to': {'~label': 'Updatedtimestamp', 'key': 'Snowflake://production.esikmo/floes'}}],
+                _edge('Table', 'Snowflake://production.esikmo/igloo',
+                      'Updatedtimestamp', 'Snowflake://production.esikmo/igloo'),
+                _edge('Table', 'Snowflake://production.esikmo/floes',
+                      'Updatedtimestamp', 'Snowflake://production.esikmo/floes')],
             VertexTypes.Updatedtimestamp.value: [
-                {'key': 'amundsen_updated_timestamp', 'latest_timestamp': created_at},
-                {'key': 'Snowflake://production.esikmo/igloo', 'latest_timestamp': created_at},
-                {'key': 'Snowflake://production.esikmo/floes', 'latest_timestamp': created_at}],
+                {'key': 'amundsen_updated_timestamp', 'latest_timestamp': _CREATED_AT},
+                {'key': 'Snowflake://production.esikmo/igloo', 'latest_timestamp': _CREATED_AT},
+                {'key': 'Snowflake://production.esikmo/floes', 'latest_timestamp': _CREATED_AT}],
             EdgeTypes.Column.value: [
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'Column', 'key': 'Snowflake://production.esikmo/igloo/block1'}},
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'Column', 'key': 'Snowflake://production.esikmo/igloo/block2'}}],
+                _edge('Table', 'Snowflake://production.esikmo/igloo',
+                      'Column', 'Snowflake://production.esikmo/igloo/block1'),
+                _edge('Table', 'Snowflake://production.esikmo/igloo',
+                      'Column', 'Snowflake://production.esikmo/igloo/block2')],
             VertexTypes.Column.value: [
                 {'col_type': 'ice', 'key': 'Snowflake://production.esikmo/igloo/block1',
                  'name': 'block1', 'sort_order': 1},
                 {'col_type': 'ice', 'key': 'Snowflake://production.esikmo/igloo/block2',
                  'name': 'block2', 'sort_order': 2}],
             EdgeTypes.Description.value: [
-                {'created': created_at, '~from': f'{get_shard()}:Column:Snowflake://production.esikmo/igloo/block1',
-                 '~to': f'{get_shard()}:Description:Snowflake://production.esikmo/igloo/block1/_user_description'},
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'Description', 'key': 'Snowflake://production.esikmo/igloo/_other_description'}},
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'Description', 'key': 'Snowflake://production.esikmo/igloo/_user_description'}}],
+                {'created': _CREATED_AT, '~from': f'{_SHARD}:Column:Snowflake://production.esikmo/igloo/block1',
+                 '~to': f'{_SHARD}:Description:Snowflake://production.esikmo/igloo/block1/_user_description'},
+                _edge('Table', 'Snowflake://production.esikmo/igloo',
+                      'Description', 'Snowflake://production.esikmo/igloo/_other_description'),
+                _edge('Table', 'Snowflake://production.esikmo/igloo',
+                      'Description', 'Snowflake://production.esikmo/igloo/_user_description')],
             VertexTypes.Description.value: [
                 {'description': 'won', 'key': 'Snowflake://production.esikmo/igloo/block1/_user_description',
                  'description_source': 'user'},
@@ -145,38 +185,29 @@ class TestGetGraph(unittest.TestCase):
                 {'description': "it's " 'cool', 'key': 'Snowflake://production.esikmo/igloo/_user_description',
                  'description_source': 'user'}],
             EdgeTypes.Generates.value: [
-                {'created': created_at, '~from': {'~label': 'Application', 'key': 'eskimo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'}},
-                {'created': created_at, '~from': {'~label': 'Application', 'key': 'eskimo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/floes'}}],
-        })
+                _edge('Application', 'eskimo', 'Table', 'Snowflake://production.esikmo/igloo'),
+                _edge('Application', 'eskimo', 'Table', 'Snowflake://production.esikmo/floes')],
+        }))
         actual = GetGraph.table_entities(
-            table_data=table_data, created_at=created_at, g=None)
+            table_data=table_data, created_at=_CREATED_AT, g=None)
         # make the diff a little better
-        self.assertDictEqual(_transform_dict(expected, transform_key=attrgetter('label')),
-                             _transform_dict(actual, transform_key=attrgetter('label')))
+        self.assertDictEqual(_relabel(expected), _relabel(actual))
 
     def test_table_entities_app_prefix(self, fetch_existing: Any) -> None:
         table_data = [Table(database='Snowflake', cluster='production', schema='esikmo', name='igloo', columns=[],
                             table_writer=Application(id='eskimo'))]
 
-        def side_effect(*args: Any, existing: EXISTING, **kwargs: Any) -> None:
-            _FetchExisting._fake_into_existing_vertexes_for_testing(
-                _existing=existing, _type=VertexTypes.Application, id='app-eskimo', key='app-eskimo')
-
-        fetch_existing.table_entities.side_effect = side_effect
+        fetch_existing.table_entities.side_effect = _fake_existing_side_effect(
+            VertexTypes.Application, id='app-eskimo', key='app-eskimo')
 
-        created_at = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185)
         expected = _create_expected({
             EdgeTypes.Generates.value: [
-                {'created': created_at, '~from': {'~label': 'Application', 'key': 'app-eskimo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'}},
+                _edge('Application', 'app-eskimo', 'Table', 'Snowflake://production.esikmo/igloo'),
             ],
         })
-        actual = GetGraph.table_entities(table_data=table_data, created_at=created_at, g=None)
+        actual = GetGraph.table_entities(table_data=table_data, created_at=_CREATED_AT, g=None)
         # make the diff a little better, and only look at the expected ones
-        self.assertDictEqual(dict((k.label, v) for k, v in expected.items()),
-                             dict((k.label, actual[k]) for k, v in expected.items()))
+        self.assertDictEqual(_relabel(expected), _relabel({k: actual[k] for k in expected}))
 
     def test_table_entities_app_owner(self, fetch_existing: Any) -> None:
         table_data = [Table(
@@ -184,23 +215,17 @@ class TestGetGraph(unittest.TestCase):
             table_writer=Application(id='eskimo'),
         )]
 
-        def side_effect(*args: Any, existing: EXISTING, **kwargs: Any) -> None:
-            _FetchExisting._fake_into_existing_vertexes_for_testing(
-                _existing=existing, _type=VertexTypes.User, user_id='eskimo', key='eskimo')
+        fetch_existing.table_entities.side_effect = _fake_existing_side_effect(
+            VertexTypes.User, user_id='eskimo', key='eskimo')
 
-        fetch_existing.table_entities.side_effect = side_effect
-
-        created_at = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185)
         expected = _create_expected({
             EdgeTypes.Owner.value: [
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'User', 'key': 'eskimo'}}],
+                _edge('Table', 'Snowflake://production.esikmo/igloo', 'User', 'eskimo')],
         })
         actual = GetGraph.table_entities(
-            table_data=table_data, created_at=created_at, g=None)
+            table_data=table_data, created_at=_CREATED_AT, g=None)
         # make the diff a little better, and only look at the expected ones
-        self.assertDictEqual(dict((k.label, v) for k, v in expected.items()),
-                             dict((k.label, actual[k]) for k, v in expected.items()))
+        self.assertDictEqual(_relabel(expected), _relabel({k: actual[k] for k in expected}))
 
     def test_user_entities(self, fetch_existing: Any) -> None:
         user_data = [
@@ -221,8 +246,7 @@ class TestGetGraph(unittest.TestCase):
 
         actual = GetGraph.user_entities(user_data=user_data, g=None)
         # make the diff a little better
-        self.assertDictEqual(dict((k.label, v) for k, v in expected.items()),
-                             dict((k.label, v) for k, v in actual.items()))
+        self.assertDictEqual(_relabel(expected), _relabel(actual))
 
     def test_app_entities(self, fetch_existing: Any) -> None:
         app_data = [Application(application_url="wais://", description="description", id="college", name="essay")]
@@ -234,85 +258,78 @@ class TestGetGraph(unittest.TestCase):
         })
         actual = GetGraph.app_entities(app_data=app_data, g=None)
         # make the diff a little better
-        self.assertDictEqual(dict((k.label, v) for k, v in expected.items()),
-                             dict((k.label, v) for k, v in actual.items()))
+        self.assertDictEqual(_relabel(expected), _relabel(actual))
 
     def test_duplicates_ok(self, fetch_existing: Any) -> None:
         table_data = [
             Table(database='Snowflake', cluster='production', schema='esikmo', name='igloo', columns=[]),
             Table(database='Snowflake', cluster='production', schema='esikmo', name='electric-bugaloo', columns=[])]
 
-        created_at = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185)
-        expected = _create_expected({
-            # only one of these, from here:
-            VertexTypes.Database.value: [
-                {'key': 'database://Snowflake', 'name': 'Snowflake'},
-            ],
-            EdgeTypes.Cluster.value: [
-                {'created': created_at, '~from': {'~label': 'Database', 'key': 'database://Snowflake'},
-                 '~to': {'~label': 'Cluster', 'key': 'Snowflake://production'}},
-            ],
-            VertexTypes.Cluster.value: [
-                {'key': 'Snowflake://production', 'name': 'production'},
-            ],
-            EdgeTypes.Schema.value: [
-                {'created': created_at, '~from': {'~label': 'Cluster', 'key': 'Snowflake://production'},
-                 '~to': {'~label': 'Schema', 'key': 'Snowflake://production.esikmo'}},
-            ],
-            VertexTypes.Schema.value: [
-                {'key': 'Snowflake://production.esikmo', 'name': 'esikmo'},
-            ],
-            # ...to here.
+        # only one of each of these
+        expected = dict(self.expected_esikmo)
+        expected.update(_create_expected({
             EdgeTypes.Table.value: [
-                {'created': created_at, '~from': {'~label': 'Schema', 'key': 'Snowflake://production.esikmo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/electric-bugaloo'}},
-                {'created': created_at, '~from': {'~label': 'Schema', 'key': 'Snowflake://production.esikmo'},
-                 '~to': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'}},
+                _edge('Schema', 'Snowflake://production.esikmo',
+                      'Table', 'Snowflake://production.esikmo/electric-bugaloo'),
+                _edge('Schema', 'Snowflake://production.esikmo', 'Table', 'Snowflake://production.esikmo/igloo'),
             ],
             VertexTypes.Table.value: [
                 {'is_view': False, 'key': 'Snowflake://production.esikmo/electric-bugaloo', 'name': 'electric-bugaloo'},
                 {'is_view': False, 'key': 'Snowflake://production.esikmo/igloo', 'name': 'igloo'},
             ],
             EdgeTypes.LastUpdatedAt.value: [
-                {'created': created_at,
-                 '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/electric-bugaloo'},
-                 '~to': {'~label': 'Updatedtimestamp', 'key': 'Snowflake://production.esikmo/electric-bugaloo'}},
-                {'created': created_at, '~from': {'~label': 'Table', 'key': 'Snowflake://production.esikmo/igloo'},
-                 '~to': {'~label': 'Updatedtimestamp', 'key': 'Snowflake://production.esikmo/igloo'}},
+                _edge('Table', 'Snowflake://production.esikmo/electric-bugaloo',
+                      'Updatedtimestamp', 'Snowflake://production.esikmo/electric-bugaloo'),
+                _edge('Table', 'Snowflake://production.esikmo/igloo',
+                      'Updatedtimestamp', 'Snowflake://production.esikmo/igloo'),
             ],
             VertexTypes.Updatedtimestamp.value: [
-                {'key': 'amundsen_updated_timestamp', 'latest_timestamp': created_at},
-                {'key': 'Snowflake://production.esikmo/electric-bugaloo', 'latest_timestamp': created_at},
-                {'key': 'Snowflake://production.esikmo/igloo', 'latest_timestamp': created_at},
+                {'key': 'amundsen_updated_timestamp', 'latest_timestamp': _CREATED_AT},
+                {'key': 'Snowflake://production.esikmo/electric-bugaloo', 'latest_timestamp': _CREATED_AT},
+                {'key': 'Snowflake://production.esikmo/igloo', 'latest_timestamp': _CREATED_AT},
             ],
-        })
+        }))
 
-        actual = GetGraph.table_entities(table_data=table_data, created_at=created_at, g=None)
+        actual = GetGraph.table_entities(table_data=table_data, created_at=_CREATED_AT, g=None)
         # make the diff a little better
-        self.assertDictEqual(dict((k.label, v) for k, v in expected.items()),
-                             dict((k.label, v) for k, v in actual.items()))
+        self.assertDictEqual(_relabel(expected), _relabel(actual))
 
     def test_duplicates_explode(self, fetch_existing: Any) -> None:
         user_data = [Fixtures.next_user(user_id='u'), Fixtures.next_user(user_id='u'), Fixtures.next_user(user_id='u')]
         # with self.assertRaisesRegex(AssertionError, 'we already have a .*id=User:u that is different: '):
         with self.assertLogs('amundsen_gremlin.neptune_bulk_loader.gremlin_model_converter', level='INFO') as cm:
             GetGraph.user_entities(user_data=user_data, g=None)
+        expected_message = f'we already have a type: User, id={_SHARD}:User:u that is different'
         self.assertTrue(
-            len(cm.output) == 2
-            and all(f'we already have a type: User, id={get_shard()}:User:u that is different' in line for line in cm.output),
+            len(cm.output) == 2 and all(expected_message in line for line in cm.output),
             f'expected message in {cm.output}')
 
 
 @pytest.mark.roundtrip
 class TestGetGraphRoundTrip(unittest.TestCase):
+    app: ClassVar[Flask]
+    app_context: ClassVar[AppContext]
+    bulk_loader: ClassVar[NeptuneBulkLoaderApi]
+    _neptune_graph_traversal_source_factory: ClassVar[Callable[[], GraphTraversalSource]]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = Flask(__name__)
+        cls.app_context = cls.app.app_context()
+        cls.app.config.from_object(LocalGremlinConfig())
+        cls.app_context.push()
+        cls.bulk_loader = NeptuneBulkLoaderApi.create_from_config(cls.app.config)
+        cls._neptune_graph_traversal_source_factory = \
+            get_neptune_graph_traversal_source_factory_from_config(cls.app.config)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.app_context.pop()
+
     def setUp(self) -> None:
         self.maxDiff = None
-        self.app = Flask(__name__)
-        self.app_context = self.app.app_context()
-        self.app.config.from_object(LocalGremlinConfig())
-        self.app_context.push()
-        self.bulk_loader = NeptuneBulkLoaderApi.create_from_config(self.app.config)
-        self.neptune_graph_traversal_source_factory = get_neptune_graph_traversal_source_factory_from_config(self.app.config)
+        # via the class, so it isn't bound to the test instance
+        self.neptune_graph_traversal_source_factory = type(self)._neptune_graph_traversal_source_factory
         self._drop_almost_everything()
 
     def _drop_almost_everything(self) -> None:
@@ -320,12 +337,11 @@ class TestGetGraphRoundTrip(unittest.TestCase):
 
     def tearDown(self) -> None:
         delete_graph_for_shard_only(self.neptune_graph_traversal_source_factory())
-        self.app_context.pop()
 
     def _bulk_load_entities_successfully(
             self, *, entities: Mapping[GraphEntityType, Mapping[str, GraphEntity]], **kwargs: Any) -> None:
         self.bulk_loader.bulk_load_entities(
-            entities=entities, raise_if_failed=True, object_prefix=f'{{now}}/{get_shard()}', **kwargs)
+            entities=entities, raise_if_failed=True, object_prefix=f'{{now}}/{_SHARD}', **kwargs)
 
     def test_table_entities(self) -> None:
         app_data = [Application(id='eskimo')]
@@ -346,7 +362,7 @@ class TestGetGraphRoundTrip(unittest.TestCase):
             add_app_entities(app_data).add_table_entities(table_data).complete()
         self._bulk_load_entities_successfully(entities=entities1)
 
-        created_at = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185) + datetime.timedelta(seconds=10, days=1)
+        created_at = _CREATED_AT_NEXT_DAY
         entities2 = GetGraph(created_at=created_at, g=self.neptune_graph_traversal_source_factory()).\
             add_app_entities(app_data).add_table_entities(table_data).complete()
 
@@ -359,77 +375,23 @@ class TestGetGraphRoundTrip(unittest.TestCase):
         pass
 
 
+_APPLICATION_KEY_CASES = (
+    ('foo', frozenset({'app-foo', 'foo'})),
+    ('app-foo', frozenset({'app-foo', 'foo'})),
+    ('foo-devel', frozenset({'app-foo', 'foo', 'app-foo-devel', 'foo-devel'})),
+    ('foo-development', frozenset({'app-foo', 'foo', 'app-foo-development', 'foo-development'})),
+    ('foo-stage', frozenset({'app-foo', 'foo', 'app-foo-stage', 'foo-stage'})),
+    ('foo-staging', frozenset({'app-foo', 'foo', 'app-foo-staging', 'foo-staging'})),
+    ('foo-prod', frozenset({'app-foo', 'foo', 'app-foo-prod', 'foo-prod'})),
+    ('foo-production', frozenset({'app-foo', 'foo', 'app-foo-production', 'foo-production'})),
+)
+
+
 class TestGetGraphMisc(unittest.TestCase):
     def test_possible_application_names_application_key(self) -> None:
-        self.assertSetEqual({'app-foo', 'foo'}, set(possible_application_names_application_key('foo')))
-        self.assertSetEqual({'app-foo', 'foo'}, set(possible_application_names_application_key('app-foo')))
-        self.assertSetEqual({'app-foo', 'foo', 'app-foo-devel', 'foo-devel'},
-                            set(possible_application_names_application_key('foo-devel')))
-        self.assertSetEqual({'app-foo', 'foo', 'app-foo-development', 'foo-development'},
-                            set(possible_application_names_application_key('foo-development')))
-        self.assertSetEqual({'app-foo', 'foo', 'app-foo-stage', 'foo-stage'},
-                            set(possible_application_names_application_key('foo-stage')))
-        self.assertSetEqual({'app-foo', 'foo', 'app-foo-staging', 'foo-staging'},
-                            set(possible_application_names_application_key('foo-staging')))
-        self.assertSetEqual({'app-foo', 'foo', 'app-foo-prod', 'foo-prod'},
-                            set(possible_application_names_application_key('foo-prod')))
-        self.assertSetEqual({'app-foo', 'foo', 'app-foo-production', 'foo-production'},
-                            set(possible_application_names_application_key('foo-production')))
-
-
-K = TypeVar('K', bound=Hashable)
-V = TypeVar('V')
-K2 = TypeVar('K2', bound=Hashable)
-V2 = TypeVar('V2')
-
-
-def _transform_dict(  # noqa: C901
-        mapping: Mapping[K, V], *, if_key: Optional[Callable[[K], bool]] = None,
-        if_value: Optional[Callable[[V], bool]] = None, if_item: Optional[Callable[[K, V], bool]] = None,
-        transform_key: Optional[Callable[[K], K2]] = None, transform_value: Optional[Callable[[V], V2]] = None,
-        transform_item: Optional[Callable[[K, V], Tuple[K2, V2]]] = None) -> Union[Dict[K, V], Dict[K2, V], Dict[K, V2], Dict[K2, V2]]:
-    assert len([c for c in (if_key, if_value, if_item) if c is not None]) <= 1, \
-        f'expected exactly at most one of if_key, if_value, or if_item'
-    assert len([c for c in (transform_key, transform_value, transform_item) if c is not None]) <= 1, \
-        f'expected exactly at most one of transform_key, transform_value, or transform_item'
-
-    # I couldn't make mypy like the overloading
-    if transform_key is not None:
-        if if_key is not None:
-            return dict([(transform_key(k), v) for k, v in mapping.items() if if_key(k)])
-        elif if_value is not None:
-            return dict([(transform_key(k), v) for k, v in mapping.items() if if_value(v)])
-        elif if_item is not None:
-            return dict([(transform_key(k), v) for k, v in mapping.items() if if_item(k, v)])
-        else:
-            return dict([(transform_key(k), v) for k, v in mapping.items()])
-    elif transform_value is not None:
-        if if_key is not None:
-            return dict([(k, transform_value(v)) for k, v in mapping.items() if if_key(k)])
-        elif if_value is not None:
-            return dict([(k, transform_value(v)) for k, v in mapping.items() if if_value(v)])
-        elif if_item is not None:
-            return dict([(k, transform_value(v)) for k, v in mapping.items() if if_item(k, v)])
-        else:
-            return dict([(k, transform_value(v)) for k, v in mapping.items()])
-    elif transform_item is not None:
-        if if_key is not None:
-            return dict([transform_item(k, v) for k, v in mapping.items() if if_key(k)])
-        elif if_value is not None:
-            return dict([transform_item(k, v) for k, v in mapping.items() if if_value(v)])
-        elif if_item is not None:
-            return dict([transform_item(k, v) for k, v in mapping.items() if if_item(k, v)])
-        else:
-            return dict([transform_item(k, v) for k, v in mapping.items()])
-    else:
-        if if_key is not None:
-            return dict([(k, v) for k, v in mapping.items() if if_key(k)])
-        elif if_value is not None:
-            return dict([(k, v) for k, v in mapping.items() if if_value(v)])
-        elif if_item is not None:
-            return dict([(k, v) for k, v in mapping.items() if if_item(k, v)])
-        else:
-            return dict([(k, v) for k, v in mapping.items()])
+        for application_key, expected in _APPLICATION_KEY_CASES:
+            with self.subTest(application_key=application_key):
+                self.assertSetEqual(expected, frozenset(possible_application_names_application_key(application_key)))
 
 
 VERTEX_OR_EDGE_TYPE = TypeVar('VERTEX_OR_EDGE_TYPE', bound=Union[VertexType, EdgeType])
@@ -0,0 +1,36 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import socket
+import ssl
+import unittest
+
+from ssl_override_server_hostname.ssl_context import (
+    OverrideServerHostnameSSLContext
+)
+
+
+class OverrideServerHostnameSSLContextTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.context = OverrideServerHostnameSSLContext(ssl.PROTOCOL_TLS_CLIENT, server_hostname='override')
+
+    def test_wrap_socket(self) -> None:
+        with self.context.wrap_socket(socket.socket(), server_hostname='original') as actual:
+            self.assertEqual('override', actual.server_hostname)
+
+    def test_wrap_socket_positional(self) -> None:
+        with self.context.wrap_socket(socket.socket(), False, True, True, 'original') as actual:
+            self.assertEqual('override', actual.server_hostname)
+
+    def test_wrap_bio(self) -> None:
+        actual = self.context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname='original')
+        self.assertEqual('override', actual.server_hostname)
+
+    def test_wrap_bio_positional(self) -> None:
+        actual = self.context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), False, 'original')
+        self.assertEqual('override', actual.server_hostname)
+
+    def test_change_server_hostname(self) -> None:
+        self.context.change_server_hostname('changed')
+        actual = self.context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname='original')
+        self.assertEqual('changed', actual.server_hostname)
@@ -3,6 +3,8 @@
 
 import datetime
 import unittest
+from contextlib import contextmanager
+from typing import Iterator, Mapping
 
 import pytz
 from gremlin_python.process.traversal import Cardinality
@@ -14,10 +16,21 @@ from amundsen_gremlin.gremlin_model import (
 from amundsen_gremlin.test_and_development_shard import get_shard
 
 
+@contextmanager
+def _assertion_error_containing(test: unittest.TestCase, message: str) -> Iterator[None]:
+    # a plain substring check, the messages have plenty of regex metacharacters in them
+    with test.assertRaises(AssertionError) as cm:
+        yield
+    test.assertIn(message, str(cm.exception))
+
+
 class TestGremlinEnums(unittest.TestCase):
     def test_enum_unique_labels(self) -> None:
-        self.assertIsInstance(VertexTypes.by_label(), dict)
-        self.assertIsInstance(EdgeTypes.by_label(), dict)
+        self.assertIsInstance(VertexTypes.by_label(), Mapping)
+        self.assertIsInstance(EdgeTypes.by_label(), Mapping)
+        self.assertIs(VertexTypes.Column, VertexTypes.by_label()['Column'])
+        with self.assertRaises(TypeError):
+            VertexTypes.by_label()['Column'] = VertexTypes.Table  # type: ignore
 
     def test_cardinality(self) -> None:
         self.assertEqual(Cardinality.set_, GremlinCardinality.set.gremlin_python_cardinality())
@@ -27,70 +40,70 @@ class TestGremlinTyper(unittest.TestCase):
     def test_boolean_type(self) -> None:
         self.assertEqual('True', GremlinType.Boolean.value.format(True))
         self.assertEqual('False', GremlinType.Boolean.value.format(False))
-        with self.assertRaisesRegex(AssertionError, 'expected bool'):
+        with _assertion_error_containing(self, 'expected bool'):
             GremlinType.Boolean.value.is_allowed('hi')
-        with self.assertRaisesRegex(AssertionError, 'expected bool'):
+        with _assertion_error_containing(self, 'expected bool'):
             GremlinType.Boolean.value.is_allowed('True')
 
     def test_byte_type(self) -> None:
         a_byte = 2**7 - 1
         self.assertEqual('127', GremlinType.Byte.value.format(a_byte))
         GremlinType.Byte.value.is_allowed(a_byte)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]7, 2[*][*]7[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**7, 2**7)'):
             GremlinType.Byte.value.is_allowed('hi')
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]7, 2[*][*]7[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**7, 2**7)'):
             GremlinType.Byte.value.is_allowed(2**7)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]7, 2[*][*]7[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**7, 2**7)'):
             GremlinType.Byte.value.is_allowed(-(2**7+1))
 
     def test_short_type(self) -> None:
         a_short = 2**7 + 1
         self.assertEqual('129', GremlinType.Short.value.format(a_short))
         GremlinType.Short.value.is_allowed(a_short)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]15, 2[*][*]15[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**15, 2**15)'):
             GremlinType.Short.value.is_allowed('hi')
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]15, 2[*][*]15[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**15, 2**15)'):
             GremlinType.Short.value.is_allowed(2**15)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]15, 2[*][*]15[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**15, 2**15)'):
             GremlinType.Short.value.is_allowed(-(2**15+1))
 
     def test_int_type(self) -> None:
         a_int = 2**15 + 1
         self.assertEqual('32769', GremlinType.Int.value.format(a_int))
         GremlinType.Int.value.is_allowed(a_int)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]31, 2[*][*]31[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**31, 2**31)'):
             GremlinType.Int.value.is_allowed('hi')
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]31, 2[*][*]31[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**31, 2**31)'):
             GremlinType.Int.value.is_allowed(2**31)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]31, 2[*][*]31[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**31, 2**31)'):
             GremlinType.Int.value.is_allowed(-(2**31+1))
 
     def test_long_type(self) -> None:
         a_long = 2**31 + 1
         self.assertEqual('2147483649', GremlinType.Long.value.format(a_long))
         GremlinType.Long.value.is_allowed(a_long)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]63, 2[*][*]63[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**63, 2**63)'):
             GremlinType.Long.value.is_allowed('hi')
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]63, 2[*][*]63[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**63, 2**63)'):
             GremlinType.Long.value.is_allowed(2**63)
-        with self.assertRaisesRegex(AssertionError, 'expected int in [[]-2[*][*]63, 2[*][*]63[)]'):
+        with _assertion_error_containing(self, 'expected int in [-2**63, 2**63)'):
             GremlinType.Long.value.is_allowed(-(2**63+1))
 
     def test_float_type(self) -> None:
         a_float = float(4/3)
         self.assertEqual('1.3333333333333333', GremlinType.Float.value.format(a_float))
-        with self.assertRaisesRegex(AssertionError, 'expected float'):
+        with _assertion_error_containing(self, 'expected float'):
             GremlinType.Float.value.format('hi')
-        with self.assertRaisesRegex(AssertionError, 'expected float.'):
+        with _assertion_error_containing(self, 'expected float,'):
             GremlinType.Float.value.is_allowed('hi')
         GremlinType.Float.value.is_allowed(a_float)
 
     def test_string_type(self) -> None:
         a_str = 'hi'
         self.assertEqual('hi', GremlinType.String.value.format(a_str))
-        with self.assertRaisesRegex(AssertionError, 'expected str'):
+        with _assertion_error_containing(self, 'expected str'):
             GremlinType.String.value.format(10)
-        with self.assertRaisesRegex(AssertionError, 'expected str'):
+        with _assertion_error_containing(self, 'expected str'):
             GremlinType.String.value.is_allowed(10)
         GremlinType.String.value.is_allowed(a_str)
 
@@ -98,11 +111,11 @@ class TestGremlinTyper(unittest.TestCase):
         a_datetime = datetime.datetime(2020, 5, 27, 10, 50, 50, 924185)
         self.assertEqual('2020-05-27T10:50:50', GremlinType.Date.value.format(a_datetime))
         self.assertEqual('2020-05-27', GremlinType.Date.value.format(a_datetime.date()))
-        with self.assertRaisesRegex(AssertionError, 'wat?'):
+        with _assertion_error_containing(self, 'wat?'):
             GremlinType.Date.value.format('2020-05-27')
-        with self.assertRaisesRegex(AssertionError, 'expected datetime.'):
+        with _assertion_error_containing(self, 'expected datetime.'):
             GremlinType.Date.value.is_allowed('2020-05-27')
-        with self.assertRaisesRegex(AssertionError, 'expected datetime.'):
+        with _assertion_error_containing(self, 'expected datetime.'):
             GremlinType.Date.value.is_allowed(a_datetime.astimezone(pytz.utc))
         GremlinType.Date.value.is_allowed(a_datetime)
         GremlinType.Date.value.is_allowed(a_datetime.date())
@@ -122,8 +135,10 @@ class TestVertexType(unittest.TestCase):
         self.assertEqual(actual.get('key'), 'column_key')
 
     def test_create_type_explodes_if_id_format(self) -> None:
-        with self.assertRaisesRegex(AssertionError, 'id_format: {shard}:{foo}:bar has parameters:'):
+        with _assertion_error_containing(self, 'id_format: {shard}:{foo}:bar has parameters:'):
             VertexType.construct_type(id_format='{foo}:bar')
+        with _assertion_error_containing(self, 'id_format: {shard}:{key:{foo}}:bar has parameters:'):
+            VertexType.construct_type(id_format='{key:{foo}}:bar')
 
 
 class TestEdgeType(unittest.TestCase):
@@ -145,7 +160,7 @@ class TestEdgeType(unittest.TestCase):
                          f'COLUMN:2020-05-27T10:50:50:{get_shard()}:Column:column_key->{get_shard()}:Table:table_key')
 
     def test_create_type_explodes_if_id_format(self) -> None:
-        with self.assertRaisesRegex(AssertionError, 'id_format: {foo}:bar has parameters:'):
+        with _assertion_error_containing(self, 'id_format: {foo}:bar has parameters:'):
             EdgeType.construct_type(id_format='{foo}:bar')
 
 
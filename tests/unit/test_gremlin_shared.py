@@ -4,6 +4,7 @@
 import unittest
 
 from gremlin_python.process.graph_traversal import __
+from gremlin_python.process.traversal import Binding
 
 from amundsen_gremlin.gremlin_shared import (
     append_traversal, get_database_name_from_uri, make_cluster_uri,
@@ -51,3 +52,10 @@ class TestGremlinShared(unittest.TestCase):
         actual = append_traversal(g, w)
         expected = __.V().hasLabel('Foo').where(__.inE().outV().hasLabel('Bar'))
         self.assertEqual(actual, expected)
+
+    def test_append_traversal_keeps_bindings(self) -> None:
+        g = __.V().hasLabel('Foo')
+        w = __.where(__.has('key', Binding('key', 'foo')))
+        actual = append_traversal(g, w)
+        self.assertEqual(actual, __.V().hasLabel('Foo').where(__.has('key', Binding('key', 'foo'))))
+        self.assertDictEqual(actual.bytecode.bindings, {'key': 'foo'})
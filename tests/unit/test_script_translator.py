@@ -58,6 +58,22 @@ class ScriptTranslatorTest(unittest.TestCase):
             actual = ScriptTranslator._convert_to_string(input)
             self.assertEqual(actual, f'"{escaped}"')
 
+    def test_subclasses_convert_like_their_base(self) -> None:
+        class MyInt(int):
+            pass
+
+        class MyStr(str):
+            pass
+
+        for thing, base in ((MyInt(3), 3), (MyStr('a"b'), 'a"b')):
+            with self.subTest(thing=thing):
+                self.assertEqual(ScriptTranslator._convert_to_string(base), ScriptTranslator._convert_to_string(thing))
+
+    def test_string_escaping_past_latin1(self) -> None:
+        size = len(ScriptTranslator.ESCAPE_TABLE)
+        self.assertEqual(ScriptTranslator._convert_to_string('caf\u00e9 \u2603'), '"caf\\u00e9 \\u2603"')
+        self.assertEqual(size, len(ScriptTranslator.ESCAPE_TABLE), 'escape table grew')
+
     def test_string_datetime_zero_millis_janusgraph(self) -> None:
         g = __.property(Cardinality.single, 'created', datetime.datetime(2010, 8, 31, 19, 55, 10))
         actual = ScriptTranslatorTargetJanusgraph.translateB('g', g)
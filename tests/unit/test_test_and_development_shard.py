@@ -8,7 +8,8 @@ from unittest import mock
 from amundsen_common.tests.fixtures import Fixtures
 
 from amundsen_gremlin.test_and_development_shard import (
-    _reset_for_testing_only, _shard_default, get_shard, shard_set_explicitly
+    _reset_for_testing_only, _shard_default, _strtobool, get_shard,
+    shard_set_explicitly
 )
 
 
@@ -41,6 +42,14 @@ class TestTestShard(unittest.TestCase):
             actual = _shard_default()
             self.assertEqual('12345', actual)
 
+    def test_strtobool(self) -> None:
+        for value in ('y', 'Yes', 't', 'True', 'on', '1'):
+            self.assertTrue(_strtobool(value))
+        for value in ('n', 'No', 'f', 'False', 'off', '0'):
+            self.assertFalse(_strtobool(value))
+        with self.assertRaises(ValueError):
+            _strtobool('maybe')
+
     def test_shard_default_local(self) -> None:
         with mock.patch.dict(os.environ):
             os.environ.pop('CI', None)
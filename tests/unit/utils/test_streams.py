@@ -2,40 +2,50 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import gc
 import logging
 import sys
 import unittest
-from typing import AsyncIterator, Iterable
+from typing import Any, AsyncIterator, Dict, Iterable, List
 from unittest.mock import Mock, call
 
 import pytest
 
 from amundsen_gremlin.utils.streams import (
-    PeekingIterator, _assure_collection, async_consume_in_chunks,
-    consume_in_chunks, consume_in_chunks_with_state, one_chunk,
+    PeekingAsyncIterator, PeekingIterator, _assure_collection, _chunk_by_count,
+    async_consume_as_completed, async_consume_in_chunks, chunk, chunk_reusing,
+    consume_in_chunks, consume_in_chunks_with_state, one, one_chunk,
     reduce_in_chunks
 )
 
+# the calls expected of 5 values in chunks of 2.  (this might look a little weird, but the stream is read one value
+# ahead before the consumer gets each chunk)
+_EXPECTED_CONSUME_CALLS = (
+    call.values(), call.values(), call.values(), call.consumer((0, 1)),
+    call.values(), call.values(), call.consumer((2, 3)), call.consumer((4,)))
+_EXPECTED_CONSUME_WITH_STATE_CALLS = (
+    call.values(), call.values(), call.values(), call.state(0), call.state(1), call.consumer((0, 1)),
+    call.values(), call.values(), call.state(2), call.state(3), call.consumer((2, 3)), call.state(4),
+    call.consumer((4,)))
+_EXPECTED_REDUCE_CALLS = (
+    call.values(), call.values(), call.values(), call.consumer((0, 1), 0),
+    call.values(), call.values(), call.consumer((2, 3), 1), call.consumer((4,), 2))
 
-class TestConsumer(unittest.TestCase):
-    def test_consume_in_chunks(self) -> None:
-        values = Mock()
-        values.side_effect = list(range(5))
-        consumer = Mock()
-        parent = Mock()
-        parent.values = values
-        parent.consumer = consumer
 
-        def stream() -> Iterable[int]:
-            for _ in range(5):
-                yield values()
+class TestConsumer(unittest.TestCase):
+    def setUp(self) -> None:
+        # children of parent, so parent.mock_calls records the values, consumer (and state) calls in order
+        self.parent = Mock()
+        self.values = self.parent.values
+        self.values.side_effect = list(range(5))
+        self.consumer = self.parent.consumer
+        # lazy, so values() is only called as the stream is read
+        self.stream = map(lambda _: self.values(), range(5))
 
-        count = consume_in_chunks(stream=stream(), n=2, consumer=consumer)
+    def test_consume_in_chunks(self) -> None:
+        count = consume_in_chunks(stream=self.stream, n=2, consumer=self.consumer)
         self.assertEqual(count, 5)
-        # this might look at little weird, but PeekingIterator is why
-        self.assertSequenceEqual([call.values(), call.values(), call.values(), call.consumer((0, 1)),
-                                  call.values(), call.values(), call.consumer((2, 3)), call.consumer((4,))],
-                                 parent.mock_calls)
+        self.assertSequenceEqual(_EXPECTED_CONSUME_CALLS, self.parent.mock_calls)
 
     def test_consume_in_chunks_with_exception(self) -> None:
         consumer = Mock()
@@ -49,28 +59,35 @@ class TestConsumer(unittest.TestCase):
         self.assertSequenceEqual([call.consumer((0, 1, 2, 3)), call.consumer((4, 5, 6, 7))], consumer.mock_calls)
 
     def test_consume_in_chunks_with_state(self) -> None:
-        values = Mock()
-        values.side_effect = list(range(5))
-        consumer = Mock()
-        consumer.side_effect = list(range(1, 4))
-        state = Mock()
+        self.consumer.side_effect = list(range(1, 4))
+        state = self.parent.state
         state.side_effect = lambda x: x * 10
-        parent = Mock()
-        parent.values = values
-        parent.consumer = consumer
-        parent.state = state
-
-        def stream() -> Iterable[int]:
-            for _ in range(5):
-                yield values()
 
-        result = consume_in_chunks_with_state(stream=stream(), n=2, consumer=consumer, state=state)
+        result = consume_in_chunks_with_state(stream=self.stream, n=2, consumer=self.consumer, state=state)
         self.assertSequenceEqual(tuple(result), (0, 10, 20, 30, 40))
-        # this might look at little weird, but PeekingIterator is why
-        self.assertSequenceEqual([call.values(), call.values(), call.values(), call.state(0), call.state(1),
-                                  call.consumer((0, 1)), call.values(), call.values(), call.state(2), call.state(3),
-                                  call.consumer((2, 3)), call.state(4), call.consumer((4,))],
-                                 parent.mock_calls)
+        self.assertSequenceEqual(_EXPECTED_CONSUME_WITH_STATE_CALLS, self.parent.mock_calls)
+
+    def test_consume_in_chunks_reusing_buffer(self) -> None:
+        chunks = []
+        buffers = set()
+
+        def consumer(things: Iterable[int]) -> None:
+            chunks.append(tuple(things))
+            buffers.add(id(things))
+
+        count = consume_in_chunks(stream=range(5), n=2, consumer=consumer, reuse_buffer=True)
+        self.assertEqual(5, count)
+        self.assertSequenceEqual([(0, 1), (2, 3), (4,)], chunks)
+        self.assertEqual(1, len(buffers))
+
+    def test_consume_in_chunks_already_peeking(self) -> None:
+        consumer = Mock()
+        it = PeekingIterator(range(1, 4))
+        self.assertEqual(1, it.peek())
+        count = consume_in_chunks(stream=it, n=3, consumer=consumer, metric=lambda x: x)
+        self.assertEqual(3, count)
+        self.assertSequenceEqual([call((1, 2)), call((3,))], consumer.mock_calls)
+        self.assertFalse(it.has_more())
 
     def test_consume_in_chunks_no_batch(self) -> None:
         consumer = Mock()
@@ -79,44 +96,56 @@ class TestConsumer(unittest.TestCase):
         consumer.assert_called_once()
 
     def test_reduce_in_chunks(self) -> None:
-        values = Mock()
-        values.side_effect = list(range(5))
-        consumer = Mock()
-        consumer.side_effect = list(range(1, 4))
-        parent = Mock()
-        parent.values = values
-        parent.consumer = consumer
+        self.consumer.side_effect = list(range(1, 4))
 
-        def stream() -> Iterable[int]:
-            for _ in range(5):
-                yield values()
-
-        result = reduce_in_chunks(stream=stream(), n=2, initial=0, consumer=consumer)
+        result = reduce_in_chunks(stream=self.stream, n=2, initial=0, consumer=self.consumer)
         self.assertEqual(result, 3)
-        # this might look at little weird, but PeekingIterator is why
-        self.assertSequenceEqual([call.values(), call.values(), call.values(), call.consumer((0, 1), 0),
-                                  call.values(), call.values(), call.consumer((2, 3), 1), call.consumer((4,), 2)],
-                                 parent.mock_calls)
+        self.assertSequenceEqual(_EXPECTED_REDUCE_CALLS, self.parent.mock_calls)
 
     @pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python3.7 or higher")
     def test_async_consume_in_chunks(self) -> None:
-        values = Mock()
-        values.side_effect = list(range(5))
-        consumer = Mock()
-        parent = Mock()
-        parent.values = values
-        parent.consumer = consumer
-
         async def stream() -> AsyncIterator[int]:
             for i in range(5):
-                yield values()
+                yield self.values()
 
-        count = asyncio.run(async_consume_in_chunks(stream=stream(), n=2, consumer=consumer))
+        count = asyncio.run(async_consume_in_chunks(stream=stream(), n=2, consumer=self.consumer))
         self.assertEqual(5, count, 'count')
-        # this might look at little weird, but PeekingIterator is why
-        self.assertSequenceEqual([call.values(), call.values(), call.values(), call.consumer((0, 1)),
-                                  call.values(), call.values(), call.consumer((2, 3)), call.consumer((4,))],
-                                 parent.mock_calls)
+        self.assertSequenceEqual(_EXPECTED_CONSUME_CALLS, self.parent.mock_calls)
+
+    @pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python3.7 or higher")
+    def test_async_consume_as_completed(self) -> None:
+        consumer = Mock()
+
+        async def value(i: int, delay: float) -> int:
+            await asyncio.sleep(delay)
+            return i
+
+        stream = (value(i, delay) for i, delay in enumerate((0.1, 0, 0.01, 0)))
+        count = asyncio.run(async_consume_as_completed(stream=stream, n=2, consumer=consumer))
+        self.assertEqual(4, count)
+        # 0 is slow, so 1, 2, and 3 all get through while it's in flight
+        self.assertSequenceEqual([call(1), call(2), call(3), call(0)], consumer.mock_calls)
+
+    @pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python3.7 or higher")
+    def test_async_consume_as_completed_raises(self) -> None:
+        consumer = Mock()
+        unhandled: List[Dict[str, Any]] = []
+
+        async def bad() -> int:
+            raise ValueError('bad')
+
+        async def ok(i: int) -> int:
+            return i
+
+        async def run() -> None:
+            asyncio.get_running_loop().set_exception_handler(lambda _, context: unhandled.append(context))
+            with self.assertRaisesRegex(ValueError, 'bad'):
+                await async_consume_as_completed(stream=[bad(), bad(), ok(3)], n=3, consumer=consumer)
+            # so any unread task would be collected (and its exception reported) now
+            gc.collect()
+
+        asyncio.run(run())
+        self.assertSequenceEqual([], unhandled)
 
     def test_one_chunk_logging(self) -> None:
         it = PeekingIterator(range(1, 4))
@@ -133,6 +162,36 @@ class TestConsumer(unittest.TestCase):
         self.assertSequenceEqual([3], tuple(actual))
         self.assertFalse(has_more)
 
+    def test_one_chunk_counting_after_peek(self) -> None:
+        it = PeekingIterator(range(3))
+        self.assertEqual(0, it.peek())
+        actual, has_more = one_chunk(it=it, n=2, metric=one)
+        self.assertSequenceEqual((0, 1), tuple(actual))
+        self.assertTrue(has_more)
+        actual, has_more = one_chunk(it=it, n=2, metric=one)
+        self.assertSequenceEqual((2,), tuple(actual))
+        self.assertFalse(has_more)
+
+    def test_chunk_reusing(self) -> None:
+        chunks = []
+        buffers = set()
+        for items in chunk_reusing(range(5), n=2):
+            chunks.append(tuple(items))
+            buffers.add(id(items))
+        self.assertSequenceEqual([(0, 1), (2, 3), (4,)], chunks)
+        self.assertEqual(1, len(buffers))
+
+    def test_chunk_by_count(self) -> None:
+        for length in range(7):
+            for n in range(1, 4):
+                with self.subTest(length=length, n=n):
+                    expected = tuple(chunk(range(length), n))
+                    self.assertSequenceEqual(expected, tuple(_chunk_by_count(range(length), n)))
+                    self.assertSequenceEqual(expected, tuple(_chunk_by_count(tuple(range(length)), n)))
+                    self.assertSequenceEqual(expected, tuple(map(tuple, chunk_reusing(range(length), n))))
+                    self.assertSequenceEqual(
+                        expected, tuple(map(tuple, chunk_reusing(PeekingIterator(range(length)), n))))
+
     def test_assure_collection(self) -> None:
         actual = _assure_collection(iter(range(2)))
         self.assertIsInstance(actual, tuple)
@@ -202,4 +261,22 @@ class TestPeekingIterator(unittest.TestCase):
         it.take_peeked(0)
         self.assertEqual(1, next(it))
 
-# TODO: test PeekingAsyncIterator directly
+
+class TestPeekingAsyncIterator(unittest.TestCase):
+    @pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python3.7 or higher")
+    def test_peek_is_next(self) -> None:
+        async def stream() -> AsyncIterator[int]:
+            for i in range(2):
+                yield i
+
+        async def run() -> None:
+            it = PeekingAsyncIterator(stream())
+            self.assertEqual(0, await it.peek())
+            self.assertTrue(await it.has_more())
+            self.assertEqual(0, await it.__anext__())
+            self.assertEqual(1, await it.__anext__())
+            self.assertFalse(await it.has_more())
+            with self.assertRaises(StopAsyncIteration):
+                await it.__anext__()
+
+        asyncio.run(run())